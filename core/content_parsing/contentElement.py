@@ -1,9 +1,13 @@
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
 
-class ContentElement(BaseModel):
+@dataclass(slots=True)
+class ContentElement:
     """
     Represents a single content element extracted from a web page.
 
+    A slotted dataclass rather than a pydantic model: elements are created in bulk by the parser
+    from trusted data, so per-instance validation would be pure overhead.
+
     Attributes:
         type (str): The type of the content element (e.g., "heading", "paragraph", "image").
         content (str): The main content or data associated with the element.
@@ -11,4 +15,5 @@ class ContentElement(BaseModel):
     """
     type: str
     content: str
-    attributes: dict = Field(default_factory=dict)
+    attributes: dict = field(default_factory=dict)
+
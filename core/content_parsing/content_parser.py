@@ -1,11 +1,15 @@
 import re
+import httpx
 import requests
-from typing import List
+from typing import Callable, List
 
-from bs4 import BeautifulSoup, Tag
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 
 from core.content_parsing.contentElement import ContentElement
 from core.content_parsing.pageContent import PageContent
+from utils.http_session import SESSION, fetch_html, response_html
+from utils.pages_cache import PagesCache
+from utils.rate_limiting import DomainRateLimiter
 
 
 class ContentParser:
@@ -14,27 +18,46 @@ class ContentParser:
 
     Attributes:
         url (str): The URL of the web page to parse.
-        html_content (str): The raw HTML content of the web page.
-        soup (BeautifulSoup): The parsed HTML content.
+        html_content (str): The HTML content of the web page, decoded with the page's declared encoding.
+        tree (LexborHTMLParser): The parsed HTML content.
         container_selector (str): The CSS selector for the main content container.
         content_elements (List[ContentElement]): A list of extracted content elements.
-        subheading_pattern (Pattern): A regex pattern to identify subheadings.
+        element_handlers (dict[str, Callable]): Handlers for container children, keyed by tag name.
+        SUBHEADING_PATTERN (Pattern): A regex pattern to identify subheadings, compiled once per class.
+        session (requests.Session): The HTTP session used to fetch the page.
+        pages_cache (PagesCache | None): Optional on-disk cache consulted before fetching the page.
     """
+    SUBHEADING_PATTERN = re.compile(r'^\s*\d+(\.\d+)*\.\s+.+')
 
-    def __init__(self, url: str, container_selector: str):
+    def __init__(self, url: str, container_selector: str, session: requests.Session | None = None,
+                 pages_cache: PagesCache | None = None):
         """
         Initializes the ContentParser with a URL and container selector.
 
         Args:
             url (str): The URL of the page to parse.
             container_selector (str): The CSS selector for the content container.
+            session (requests.Session, optional): The HTTP session to use. Defaults to the shared pooled session.
+            pages_cache (PagesCache, optional): On-disk cache of fetched pages. Defaults to no caching.
         """
         self.url = url
+        self.session = session or SESSION
+        self.pages_cache = pages_cache
         self.html_content = ''
-        self.soup: BeautifulSoup | None = None
+        self.tree: LexborHTMLParser | None = None
         self.container_selector = container_selector
         self.content_elements: List[ContentElement] = []
-        self.subheading_pattern = re.compile(r'^\s*\d+(\.\d+)*\.\s+.+')
+        self.element_handlers: dict[str, Callable[[LexborNode], None]] = {
+            'table': self.process_table_of_contents,
+            'h1': self.process_heading_element,
+            'h2': self.process_heading_element,
+            'h3': self.process_heading_element,
+            'h4': self.process_heading_element,
+            'h5': self.process_heading_element,
+            'h6': self.process_heading_element,
+            'p': self.process_paragraph,
+            'img': self.process_image,
+        }
 
     def fetch_content(self):
         """
@@ -43,37 +66,71 @@ class ContentParser:
         Raises:
             HTTPError: If the HTTP request fails.
         """
-        response = requests.get(self.url)
-        response.raise_for_status()
-        self.html_content = response.text
+        if self.pages_cache:
+            self.html_content = self.pages_cache.fetch(self.session, self.url)
+            return
+
+        self.html_content = fetch_html(self.session, self.url)
+
+    async def fetch_content_async(self, client: httpx.AsyncClient, rate_limiter: DomainRateLimiter | None = None):
+        """
+        Asynchronously fetches the raw HTML content from the URL.
+
+        Args:
+            client (httpx.AsyncClient): The client used to fetch the page.
+            rate_limiter (DomainRateLimiter, optional): Spaces out requests to the page's domain.
+
+        Raises:
+            HTTPStatusError: If the HTTP request fails.
+        """
+        if self.pages_cache:
+            cached = self.pages_cache.get(self.url)
+            if cached is not None:
+                self.html_content = cached
+                return
+
+        if rate_limiter:
+            await rate_limiter.wait(self.url)
+        self.html_content = response_html(await client.get(self.url))
+
+        if self.pages_cache:
+            self.pages_cache.set(self.url, self.html_content)
 
     def parse_html(self):
         """
-        Parses the fetched HTML content using BeautifulSoup.
+        Parses the fetched HTML content using selectolax's Lexbor backend.
         """
-        self.soup = BeautifulSoup(self.html_content, 'html.parser')
+        self.tree = LexborHTMLParser(self.html_content)
 
     def parse_and_get_pure_html(self) -> str:
         """
-        Parse and return pure html from container
+        Return pure html of the page, as fetched
         """
-        if not self.soup:
+        if not self.html_content:
             self.fetch_content()
-            self.parse_html()
 
-        return self.soup.prettify()
+        return self.html_content
 
     def get_text_content(self, element):
         """
         Extracts text content from an HTML element.
 
         Args:
-            element (Tag): The HTML element to extract text from.
+            element (LexborNode): The HTML element to extract text from.
 
         Returns:
             str: The stripped text content of the element.
         """
-        return ' '.join(element.stripped_strings).strip()
+        # Most headings and paragraphs hold a single text node, which needs no traversal
+        child = element.child
+        if child is not None and child.next is None and child.tag == '-text':
+            return child.text().strip()
+        # Each text node is stripped like the single node above, and whitespace-only nodes are dropped
+        # so they leave no doubled separators behind
+        return ' '.join(
+            text for node in element.traverse(include_text=True)
+            if node.tag == '-text' and (text := node.text().strip())
+        )
 
     def is_subheading(self, text):
         """
@@ -85,18 +142,20 @@ class ContentParser:
         Returns:
             bool: True if the text matches the subheading pattern, False otherwise.
         """
-        return bool(self.subheading_pattern.match(text))
+        return bool(self.SUBHEADING_PATTERN.match(text))
 
-    def process_table_of_contents(self, table: Tag):
+    def process_table_of_contents(self, table: LexborNode):
         """
         Processes a table element, extracting links or adding it as raw HTML.
 
         Args:
-            table (Tag): The table element to process.
+            table (LexborNode): The table element to process.
         """
-        if table.select_one('a'):
-            for link in table.find_all('a'):
-                href = link.get('href', '')
+        links = table.css('a')
+        if links:
+            for link in links:
+                attributes = link.attributes
+                href = attributes.get('href') or ''
                 text = self.get_text_content(link)
                 if href and text:
                     self.content_elements.append(ContentElement(
@@ -104,15 +163,15 @@ class ContentParser:
                         content=href,
                         attributes={
                             'text': text,
-                            'title': link.get('title', ''),
-                            'target': link.get('target', '')
+                            'title': attributes.get('title') or '',
+                            'target': attributes.get('target') or ''
                         }
                     ))
         else:
             self.content_elements.append(ContentElement(
                 type='table',
                 content='',
-                attributes={'html': table.prettify()}
+                attributes={'html': table.html}
             ))
 
     def process_heading(self, text):
@@ -129,12 +188,73 @@ class ContentParser:
             attributes={}
         ))
 
-    def get_markup(self) -> str:
-        container = self.soup.select_one(self.container_selector)
+    def process_heading_element(self, element: LexborNode):
+        """
+        Processes a heading element (h1-h6).
+
+        Args:
+            element (LexborNode): The heading element to process.
+        """
+        text = self.get_text_content(element)
+        if text:
+            self.content_elements.append(ContentElement(
+                type='heading',
+                content=text,
+                attributes={'level': element.tag}
+            ))
+
+    def process_paragraph(self, element: LexborNode):
+        """
+        Processes a paragraph element as either a subheading or a paragraph.
+
+        Args:
+            element (LexborNode): The paragraph element to process.
+        """
+        text = self.get_text_content(element)
+        if text:
+            self.process_heading(text)
+
+    def process_image(self, element: LexborNode):
+        """
+        Processes an image element.
+
+        Args:
+            element (LexborNode): The image element to process.
+        """
+        attributes = element.attributes
+        src = attributes.get('src') or ''
+        if src:
+            self.content_elements.append(ContentElement(
+                type='image',
+                content=src,
+                attributes={
+                    'alt': attributes.get('alt') or '',
+                    'title': attributes.get('title') or '',
+                    'width': attributes.get('width') or '',
+                    'height': attributes.get('height') or ''
+                }
+            ))
+
+    def find_container(self) -> LexborNode:
+        """
+        Finds the main content container in the parsed tree.
+
+        Raises:
+            ValueError: If the container cannot be found using the selector.
+
+        Returns:
+            LexborNode: The container element.
+        """
+        container = self.tree.css_first(self.container_selector)
         if not container:
             raise ValueError(f"Container with selector '{self.container_selector}' not found.")
+        return container
+
+    def get_markup(self) -> str:
+        if not self.tree:
+            self.parse_html()
 
-        return container.prettify()
+        return self.find_container().html
 
 
     def parse_container(self):
@@ -144,52 +264,33 @@ class ContentParser:
         Raises:
             ValueError: If the container cannot be found using the selector.
         """
-        container = self.soup.select_one(self.container_selector)
-        if not container:
-            raise ValueError(f"Container with selector '{self.container_selector}' not found.")
+        container = self.find_container()
 
-        for element in container.find_all(recursive=False):
-            if element.name == 'table':
-                self.process_table_of_contents(element)
-            elif element.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                text = self.get_text_content(element)
-                if text:
-                    self.content_elements.append(ContentElement(
-                        type='heading',
-                        content=text,
-                        attributes={'level': element.name}
-                    ))
-            elif element.name == 'p':
-                text = self.get_text_content(element)
-                if text:
-                    self.process_heading(text)
-            elif element.name == 'img':
-                src = element.get('src', '')
-                if src:
-                    self.content_elements.append(ContentElement(
-                        type='image',
-                        content=src,
-                        attributes={
-                            'alt': element.get('alt', ''),
-                            'title': element.get('title', ''),
-                            'width': element.get('width', ''),
-                            'height': element.get('height', '')
-                        }
-                    ))
+        handlers = self.element_handlers
+        for element in container.iter():
+            handler = handlers.get(element.tag)
+            if handler:
+                handler(element)
 
     def parse(self, only_markup: bool = False) -> str | PageContent:
         """
         Main method to fetch, parse, and extract content elements.
 
+        The page is fetched and parsed at most once per parser, so repeated calls
+        (e.g. markup and structured content of the same page) reuse the earlier results.
+
         Returns:
             PageContent: The parsed content as a structured `PageContent` object.
         """
-        self.fetch_content()
-        self.parse_html()
+        if not self.html_content:
+            self.fetch_content()
 
         if only_markup:
             markup = self.get_markup()
             return markup
 
-        self.parse_container()
+        if not self.tree:
+            self.parse_html()
+        if not self.content_elements:
+            self.parse_container()
         return PageContent(elements=self.content_elements)
@@ -1,19 +1,42 @@
 import os
-import requests
+import asyncio
+import shutil
 import hashlib
 
-from bs4 import BeautifulSoup
+import aiofiles
+import httpx
+from selectolax.lexbor import LexborHTMLParser
 from urllib.parse import urljoin
 
 from core.sitemap_extraction.article import Article
+from utils.http_session import REQUEST_TIMEOUT, SESSION
 
 
 class HTMLImageParser:
     """
     A class to parse HTML, extract image URLs, download them, and save locally with minimal file names.
     """
+    MAX_CONCURRENT_DOWNLOADS = 16
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
     @staticmethod
-    def extract_images(article: Article) -> list[str]:
+    def extract_images_from_tree(tree: LexborHTMLParser, base_url: str) -> list[str]:
+        """
+        Extracts all image URLs from an already parsed HTML tree.
+
+        Args:
+            tree (LexborHTMLParser): The parsed HTML content.
+            base_url (str): The URL that relative image sources are resolved against.
+
+        Returns:
+            list[str]: A list of full image URLs.
+        """
+        image_tags = tree.css('img')
+        image_urls = [urljoin(base_url, img.attributes['src']) for img in image_tags if img.attributes.get('src')]
+        return image_urls
+
+    @classmethod
+    def extract_images(cls, article: Article) -> list[str]:
         """
         Extracts all image URLs from the article's HTML content.
 
@@ -23,13 +46,28 @@ class HTMLImageParser:
         Returns:
             list[str]: A list of full image URLs.
         """
-        soup = BeautifulSoup(article.html, 'html.parser')
-        image_tags = soup.find_all('img')
-        image_urls = [urljoin(article.url, img.get('src')) for img in image_tags if img.get('src')]
-        return image_urls
+        return cls.extract_images_from_tree(LexborHTMLParser(article.html), article.url)
 
     @staticmethod
-    def download_image(url: str, save_dir: str, index: int = None) -> str:
+    def get_local_path(url: str, save_dir: str, index: int = None) -> str:
+        """
+        Builds a short and safe local path for an image URL.
+
+        Args:
+            url (str): The image URL.
+            save_dir (str): Directory to save the image in.
+            index (int, optional): Optional index for unique naming.
+
+        Returns:
+            str: The local path for the image.
+        """
+        # Generate a short unique name for the file
+        hash_digest = hashlib.blake2b(url.encode('utf-8'), digest_size=4).hexdigest()
+        filename = f"img_{index}_{hash_digest}.jpg" if index is not None else f"img_{hash_digest}.jpg"
+        return os.path.join(save_dir, filename)
+
+    @classmethod
+    def download_image(cls, url: str, save_dir: str, index: int = None) -> str:
         """
         Downloads an image from a URL, saves it locally with a short and safe file name.
 
@@ -42,24 +80,81 @@ class HTMLImageParser:
             str: The local path of the saved image or an empty string if download fails.
         """
         os.makedirs(save_dir, exist_ok=True)
+        local_path = cls.get_local_path(url, save_dir, index)
 
-        # Generate a short unique name for the file
-        hash_digest = hashlib.md5(url.encode('utf-8')).hexdigest()[:8]
-        filename = f"img_{index}_{hash_digest}.jpg" if index is not None else f"img_{hash_digest}.jpg"
-        local_path = os.path.join(save_dir, filename)
+        try:
+            with SESSION.get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                with open(local_path, 'wb') as img_file:
+                    shutil.copyfileobj(response.raw, img_file, length=cls.DOWNLOAD_CHUNK_SIZE)
+            print(f"Downloaded: {url} -> {local_path}")
+        except Exception as e:
+            print(f"Failed to download {url}: {e}")
+            return ""
+        return local_path
+
+    @classmethod
+    async def download_image_async(cls, client: httpx.AsyncClient, url: str, save_dir: str,
+                                   index: int = None, semaphore: asyncio.Semaphore = None) -> str:
+        """
+        Asynchronously downloads an image from a URL and saves it locally.
+
+        The caller must ensure `save_dir` exists; `download_images_async` creates it once for all images.
+
+        Args:
+            client (httpx.AsyncClient): The client used to fetch the image.
+            url (str): The image URL to download.
+            save_dir (str): Directory to save the downloaded image.
+            index (int, optional): Optional index for unique naming.
+            semaphore (asyncio.Semaphore, optional): Limits the number of concurrent downloads.
+
+        Returns:
+            str: The local path of the saved image or an empty string if download fails.
+        """
+        local_path = cls.get_local_path(url, save_dir, index)
+        semaphore = semaphore or asyncio.Semaphore(cls.MAX_CONCURRENT_DOWNLOADS)
 
         try:
-            response = requests.get(url, stream=True, timeout=10)
-            response.raise_for_status()
-            with open(local_path, 'wb') as img_file:
-                for chunk in response.iter_content(1024):
-                    img_file.write(chunk)
+            async with semaphore:
+                async with client.stream('GET', url) as response:
+                    response.raise_for_status()
+                    async with aiofiles.open(local_path, 'wb') as img_file:
+                        async for chunk in response.aiter_bytes(cls.DOWNLOAD_CHUNK_SIZE):
+                            await img_file.write(chunk)
             print(f"Downloaded: {url} -> {local_path}")
         except Exception as e:
             print(f"Failed to download {url}: {e}")
             return ""
         return local_path
 
+    @classmethod
+    async def download_images_async(cls, image_urls: list[str], save_dir: str) -> dict[str, str]:
+        """
+        Concurrently downloads images over a single HTTP/2 client.
+
+        Args:
+            image_urls (list[str]): The image URLs to download.
+            save_dir (str): Directory to save images.
+
+        Returns:
+            dict[str, str]: Mapping of original image URLs to local paths.
+        """
+        os.makedirs(save_dir, exist_ok=True)
+        semaphore = asyncio.Semaphore(cls.MAX_CONCURRENT_DOWNLOADS)
+        limits = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        async with httpx.AsyncClient(limits=limits, http2=True, timeout=30.0) as client:
+            downloaded = await asyncio.gather(*(
+                cls.download_image_async(client, img_url, save_dir, index, semaphore)
+                for index, img_url in enumerate(image_urls)
+            ))
+
+        return {
+            img_url: os.path.relpath(local_path, save_dir)
+            for img_url, local_path in zip(image_urls, downloaded)
+            if local_path
+        }
+
     @classmethod
     def save_images(cls, article: Article, save_dir: str) -> dict[str, str]:
         """
@@ -72,13 +167,23 @@ class HTMLImageParser:
         Returns:
             dict[str, str]: Mapping of original image URLs to local paths.
         """
-        image_urls = cls.extract_images(article)
-        local_paths = {}
-        for index, img_url in enumerate(image_urls):
-            local_path = cls.download_image(img_url, save_dir, index)
-            if local_path:
-                local_paths[img_url] = os.path.relpath(local_path, save_dir)
-        return local_paths
+        return cls.download_images(cls.extract_images(article), save_dir)
+
+    @classmethod
+    def download_images(cls, image_urls: list[str], save_dir: str) -> dict[str, str]:
+        """
+        Downloads and saves images, mapping original URLs to local paths.
+
+        Args:
+            image_urls (list[str]): The image URLs to download.
+            save_dir (str): Directory to save images.
+
+        Returns:
+            dict[str, str]: Mapping of original image URLs to local paths.
+        """
+        if not image_urls:
+            return {}
+        return asyncio.run(cls.download_images_async(image_urls, save_dir))
 
     @classmethod
     def update_image_links(cls, article: Article, save_dir: str) -> str:
@@ -93,17 +198,34 @@ class HTMLImageParser:
         Returns:
             str: The updated HTML content.
         """
-        # Parse the HTML
-        soup = BeautifulSoup(article.html, 'html.parser')
+        return cls.rewrite_image_links(article, save_dir)[0]
+
+    @classmethod
+    def rewrite_image_links(cls, article: Article, save_dir: str) -> tuple[str, bool]:
+        """
+        Downloads the article's images and points their `src` attributes at the local copies.
+
+        Args:
+            article (Article): The article containing the HTML content.
+            save_dir (str): Directory to save the images.
+
+        Returns:
+            tuple[str, bool]: The updated HTML content, and whether every image was downloaded.
+        """
+        # Parse the HTML once and share the tree between extraction and rewriting
+        tree = LexborHTMLParser(article.html)
 
         # Download images and get their mappings
-        image_mappings = cls.save_images(article, save_dir)
+        image_urls = cls.extract_images_from_tree(tree, article.url)
+        image_mappings = cls.download_images(image_urls, save_dir)
 
         # Update the `src` attributes in the HTML
-        for img_tag in soup.find_all('img'):
-            img_url = urljoin(article.url, img_tag.get('src', ''))
+        for img_tag in tree.css('img'):
+            img_url = urljoin(article.url, img_tag.attributes.get('src') or '')
             if img_url in image_mappings:
-                img_tag['src'] = os.path.join('images', image_mappings[img_url])
+                img_tag.attrs['src'] = os.path.join('images', image_mappings[img_url])
 
-        # Return the updated HTML as a string
-        return str(soup)
+        # Return the updated fragment without the html/head/body wrapper the parser adds around it
+        body = tree.body
+        html = ''.join(node.html for node in body.iter(include_text=True)) if body is not None else tree.html
+        return html, set(image_urls) <= image_mappings.keys()
@@ -23,18 +23,14 @@ class Category(BaseModel):
         """
         Computes a hash value for the Category instance.
 
-        The hash is based on the category's name, URL, subcategories, and articles.
-        This allows the Category to be used in hashable collections like sets and as dictionary keys.
+        The hash is based on the category's name and URL, which are part of the equality check,
+        so equal categories always produce the same hash. This allows the Category to be used
+        in hashable collections like sets and as dictionary keys.
 
         Returns:
             int: The hash value of the Category.
         """
-        return hash((
-            self.name,
-            self.url,
-            self.subcategories,
-            self.articles
-        ))
+        return hash((self.name, self.url))
 
     def __eq__(self, other):
         """
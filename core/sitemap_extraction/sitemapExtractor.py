@@ -1,15 +1,22 @@
-import json
+import sys
+from pathlib import Path
 from urllib.parse import urljoin
 from typing import List
 
 import requests
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
 from pydantic import BaseModel
 
 from core.sitemap_extraction.category import Category
 from core.sitemap_extraction.article import Article
 from core.sitemap_extraction.sitemap import SiteMap
+from serialization import orjson_serializer
+from utils.data_extraction import BS4_PARSER
+from utils.file_writing import write_bytes_atomic
+from utils.http_session import SESSION, fetch_html
 from utils.normalization import normalize_sitemap
+from utils.pages_cache import PagesCache
 
 
 class ExtractorOptions(BaseModel):
@@ -37,7 +44,7 @@ class SiteMapExtractor:
     A class to extract a website's sitemap structure.
 
     Methods:
-        __init__(options: ExtractorOptions):
+        __init__(options: ExtractorOptions, session: requests.Session | None = None, pages_cache: PagesCache | None = None):
             Initializes the extractor with the specified options.
 
         extract_categories_recursive(url=None, parent=None, visited=None) -> List[Category]:
@@ -57,68 +64,125 @@ class SiteMapExtractor:
 
         load_site_map_from_json(filename: str) -> SiteMap:
             Loads a sitemap from a JSON file and returns a `SiteMap` object.
-
-        _dict_to_sitemap(data: dict) -> SiteMap:
-            Converts a dictionary to a `SiteMap` object.
-
-        _dict_to_category(data: dict) -> Category:
-            Converts a dictionary to a `Category` object.
-
-        _dict_to_article(data: dict) -> Article:
-            Converts a dictionary to an `Article` object.
     """
-    def __init__(self, options: ExtractorOptions):
+    ARTICLE_TITLE_SELECTOR = soupsieve.compile('.title')
+
+    def __init__(self, options: ExtractorOptions, session: requests.Session | None = None,
+                 pages_cache: PagesCache | None = None):
         """
         Initializes the extractor with the specified options.
 
         Args:
             options (ExtractorOptions): The options for parsing.
+            session (requests.Session, optional): The HTTP session to use. Defaults to the shared pooled session.
+            pages_cache (PagesCache, optional): On-disk cache of fetched pages. Defaults to no caching.
         """
         self.options = options
+        self.session = session or SESSION
+        self.pages_cache = pages_cache
+        self.excluded_urls = set(options.excluded_urls)
+        self.category_selectors = self.compile_selectors(options.category_tag, options.category_selectors)
+        self.article_selectors = self.compile_selectors(options.article_tag, options.article_selectors)
+        # Only category and article links are ever selected, so nothing else needs to be built into the tree
+        self.strainer = SoupStrainer([options.category_tag, options.article_tag])
+
+    @staticmethod
+    def compile_selectors(tag: str, selectors: List[str]) -> List[soupsieve.SoupSieve]:
+        """
+        Compiles `tag.selector` CSS selectors once, so they are not re-parsed for every page.
+
+        Args:
+            tag (str): The HTML tag the selectors apply to.
+            selectors (List[str]): The class names to combine with the tag.
+
+        Returns:
+            List[soupsieve.SoupSieve]: The compiled selectors.
+        """
+        return [soupsieve.compile(f"{tag}.{selector}") for selector in selectors]
+
+    def fetch_page(self, url: str) -> str:
+        """
+        Fetches the HTML of a page, consulting the pages cache first if one is set.
+
+        Args:
+            url (str): The URL of the page.
 
-    def extract_categories_recursive(self, url=None, parent: Category = None, visited=None) -> List[Category]:
+        Returns:
+            str: The HTML of the page.
+
+        Raises:
+            HTTPError: If the HTTP request fails.
+        """
+        if self.pages_cache:
+            return self.pages_cache.fetch(self.session, url)
+
+        return fetch_html(self.session, url)
+
+    def extract_categories_recursive(self, url=None, parent: Category = None,
+                                     visited: dict[str, tuple[List[Category], List[Article]] | None] = None
+                                     ) -> List[Category]:
         """
         Recursively extracts categories and subcategories from the given URL.
 
+        A category page linked from several parents is fetched and parsed only once; every later link to it
+        gets a copy of the subtree built the first time.
+
         Args:
             url (str, optional): The URL to start extraction. Defaults to the root URL.
             parent (Category, optional): The parent category for nesting subcategories.
-            visited (set, optional): A set of visited URLs to avoid cycles.
+            visited (dict, optional): The crawled URLs, shared across the recursion. Each maps to the subcategories
+                and the leaf articles extracted from its page, or to None while the page is still being crawled.
 
         Returns:
             List[Category]: A list of extracted categories.
         """
         if url is None:
             url = self.options.root_url
+        if visited is None:
+            visited = {}
 
-        response = requests.get(url)
-        response.raise_for_status()
+        # Only reached for the root page linked back to itself; other revisits are resolved at the link site
+        if url in visited:
+            return []
+        visited[url] = None
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(self.fetch_page(url), BS4_PARSER, parse_only=self.strainer)
         categories: list[Category] = []
+        seen_urls: set[str] = set()
 
-        for selector in self.options.category_selectors:
-            compiled_selector = f"{self.options.category_tag}.{selector}"
-            for category in soup.select(compiled_selector):
-                sub_url = urljoin(url, category['href'])
+        for compiled_selector in self.category_selectors:
+            for category in compiled_selector.select(soup):
+                # Category and article links repeat across pages; interned, equal URLs share one string
+                sub_url = sys.intern(urljoin(url, category['href']))
 
-                if sub_url in self.options.excluded_urls:
+                if sub_url in self.excluded_urls or sub_url in seen_urls:
                     continue
+                seen_urls.add(sub_url)
 
                 name = category.text.strip()
                 articles = self.extract_articles(soup, sub_url)
                 parsed_category = Category(name=name, url=sub_url, subcategories=[], articles=articles)
 
-                subcategories = self.extract_categories_recursive(url=sub_url, parent=parsed_category, visited=visited)
-                parsed_category.subcategories = subcategories
-
-                if not any(cat.url == sub_url for cat in categories):
-                    categories.append(parsed_category)
-
+                if sub_url in visited:
+                    crawled = visited[sub_url]
+                    # An ancestor that is still being crawled: following the link would only loop
+                    if crawled is None:
+                        continue
+                    subcategories, leaf_articles = crawled
+                    parsed_category.subcategories = [subcategory.model_copy(deep=True) for subcategory in subcategories]
+                    parsed_category.articles.extend(article.model_copy() for article in leaf_articles)
+                else:
+                    parsed_category.subcategories = self.extract_categories_recursive(
+                        url=sub_url, parent=parsed_category, visited=visited
+                    )
+                categories.append(parsed_category)
+
+        leaf_articles: list[Article] = []
         if not categories and parent:
-            articles = self.extract_articles(soup, url)
-            parent.articles.extend(articles)
+            leaf_articles = self.extract_articles(soup, url)
+            parent.articles.extend(leaf_articles)
 
+        visited[url] = (categories, leaf_articles)
         return categories
 
     def extract_articles(self, soup: BeautifulSoup, url: str) -> List[Article]:
@@ -133,18 +197,15 @@ class SiteMapExtractor:
             List[Article]: A list of extracted articles.
         """
         articles = []
-        for selector in self.options.article_selectors:
-            compiled_selector = f"{self.options.article_tag}.{selector}"
-            for article in soup.select(compiled_selector):
-                article_url = urljoin(url, article['href'])
+        for compiled_selector in self.article_selectors:
+            for article in compiled_selector.select(soup):
+                article_url = sys.intern(urljoin(url, article['href']))
 
-                if article_url in self.options.excluded_urls:
+                if article_url in self.excluded_urls:
                     continue
 
-                article_title = (
-                    article.select_one('.title').text.strip()
-                    if article.select_one('.title') else "Untitled"
-                )
+                title = self.ARTICLE_TITLE_SELECTOR.select_one(article)
+                article_title = title.text.strip() if title else "Untitled"
                 articles.append(Article(title=article_title, url=article_url, html=''))
         return articles
 
@@ -168,8 +229,7 @@ class SiteMapExtractor:
             filename (str): The path to the file where the sitemap will be saved.
         """
         site_map = self.extract_site_map()
-        with open(filename, 'w', encoding='utf-8') as file:
-            json.dump(site_map, file, indent=4, ensure_ascii=False, default=lambda o: o.__dict__)
+        self.export_results(site_map, filename)
 
     def export_results(self, site_map: SiteMap, filename: str):
         """
@@ -179,8 +239,7 @@ class SiteMapExtractor:
             site_map (SiteMap): The sitemap to export.
             filename (str): The path to the file where the sitemap will be saved.
         """
-        with open(filename, 'w', encoding='utf-8') as file:
-            json.dump(site_map, file, indent=4, ensure_ascii=False, default=lambda o: o.__dict__)
+        write_bytes_atomic(filename, orjson_serializer.dumps(site_map, indent=True))
 
     def load_site_map_from_json(self, filename: str) -> SiteMap:
         """
@@ -191,52 +250,8 @@ class SiteMapExtractor:
 
         Returns:
             SiteMap: The loaded sitemap object.
-        """
-        with open(filename, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-
-        return self._dict_to_sitemap(data)
-
-    def _dict_to_sitemap(self, data: dict) -> SiteMap:
-        """
-        Converts a dictionary to a `SiteMap` object.
-
-        Args:
-            data (dict): The dictionary representation of a sitemap.
-
-        Returns:
-            SiteMap: The reconstructed `SiteMap` object.
-        """
-        root_url = data['root_url']
-        categories = [self._dict_to_category(category) for category in data['categories']]
-        return SiteMap(root_url=root_url, categories=categories)
-
-    def _dict_to_category(self, data: dict) -> Category:
-        """
-        Converts a dictionary to a `Category` object.
 
-        Args:
-            data (dict): The dictionary representation of a category.
-
-        Returns:
-            Category: The reconstructed `Category` object.
-        """
-        name = data['name']
-        url = data['url']
-        subcategories = [self._dict_to_category(subcategory) for subcategory in data.get('subcategories', [])]
-        articles = [self._dict_to_article(article) for article in data.get('articles', [])]
-        return Category(name=name, url=url, subcategories=subcategories, articles=articles)
-
-    def _dict_to_article(self, data: dict) -> Article:
-        """
-        Converts a dictionary to an `Article` object.
-
-        Args:
-            data (dict): The dictionary representation of an article.
-
-        Returns:
-            Article: The reconstructed `Article` object.
+        Raises:
+            ValidationError: If the file content is not valid JSON or does not match the `SiteMap` schema.
         """
-        title = data['title']
-        url = data['url']
-        return Article(title=title, url=url)
+        return SiteMap.model_validate_json(Path(filename).read_bytes())
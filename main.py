@@ -17,4 +17,4 @@ if __name__ == '__main__':
     startup.add_controllers(SitemapController, StateController)
     startup.init_controllers()
 
-    startup.run_app(RunSettings.get_default_dev())
+    startup.run_app(RunSettings.get_from_env())
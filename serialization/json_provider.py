@@ -1,11 +1,48 @@
-from flask.json.provider import DefaultJSONProvider
-from pydantic import BaseModel
+import orjson
+from flask import Response
+from flask.json.provider import JSONProvider
 
+from serialization import orjson_serializer
 
-class CustomJSONProvider(DefaultJSONProvider):
-    def default(self, o):
-        if isinstance(o, BaseModel):
-            return o.model_dump()
-        if isinstance(o, bytes):
-            return o.decode('latin1')
-        return super().default(o)
+
+class CustomJSONProvider(JSONProvider):
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson_serializer.dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Build the body from orjson's bytes directly, skipping the str round-trip of dumps
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson_serializer.dumps(obj), mimetype=self.mimetype)
+
+
+def json_response(data, status: int = 200) -> Response:
+    """
+    Builds a JSON response straight from orjson's bytes.
+
+    Args:
+        data (object): The data to serialize; pydantic models are dumped by the orjson serializer.
+        status (int): The HTTP status code of the response.
+
+    Returns:
+        Response: The JSON response.
+    """
+    return json_bytes_response(orjson_serializer.dumps(data), status)
+
+
+def json_bytes_response(body: bytes, status: int = 200) -> Response:
+    """
+    Builds a JSON response from already serialized JSON.
+
+    Args:
+        body (bytes): The serialized JSON.
+        status (int): The HTTP status code of the response.
+
+    Returns:
+        Response: The JSON response.
+    """
+    return Response(body, status=status, mimetype=CustomJSONProvider.mimetype)
@@ -0,0 +1,45 @@
+import orjson
+from pydantic import BaseModel
+
+
+def default(o):
+    """
+    Serializes objects that orjson does not support natively.
+
+    Args:
+        o (object): The object to serialize.
+
+    Returns:
+        object: A JSON-serializable representation of the object.
+
+    Raises:
+        TypeError: If the object type is not supported.
+    """
+    if isinstance(o, BaseModel):
+        return o.model_dump()
+    if isinstance(o, bytes):
+        return o.decode('latin1')
+    raise TypeError(f"Object of type {o.__class__.__name__} is not JSON serializable")
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """
+    Serializes an object to UTF-8 encoded JSON bytes using orjson.
+
+    A pydantic model is serialized by pydantic-core in a single pass instead, without first
+    dumping it to a dict.
+
+    Args:
+        obj (object): The object to serialize.
+        indent (bool): Whether to pretty-print the output with two-space indentation.
+
+    Returns:
+        bytes: The serialized JSON.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump_json(indent=2 if indent else None).encode('utf-8')
+
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, default=default, option=option)
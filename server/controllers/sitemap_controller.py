@@ -1,21 +1,33 @@
-from flask import Flask, jsonify, request, send_file
+import uuid
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from flask import Flask, Response, request, send_file
 from pydantic import ValidationError
 
-from core.sitemap_extraction.category import Category
+from serialization import orjson_serializer
+from serialization.json_provider import json_bytes_response, json_response
 from server.state import ServerStateProvider
 from server.controllers.controller_base import BaseController
 
 from core.sitemap_extraction.sitemapExtractor import ExtractorOptions
+from core.sitemap_extraction.article import Article
+from core.sitemap_extraction.category import Category
 from core.sitemap_extraction.sitemap import SiteMap
 
 from core.content_parsing.content_parser import ContentParser
+from utils.pages_cache import PagesCache
 from utils.sitemap_fs import SiteMapFS
 
+from utils.article_fetching import fill_articles_html
 from utils.sitemap_loading import request_sitemap_and_export
-from utils.sitemap_navigation import find_page_by_id
+from utils.sitemap_navigation import build_page_index
 
 
 class SitemapController(BaseController):
+    MAX_FINISHED_JOBS = 100
+
     def __init__(self, app: Flask, state_provider: ServerStateProvider):
         """
         Initializes the SitemapController.
@@ -23,6 +35,13 @@ class SitemapController(BaseController):
         :param app: Flask application where the endpoints will be registered.
         :param state_provider: Reactive state provider.
         """
+        self._page_index: dict[str, Article | Category] = {}
+        self._page_index_sitemap: SiteMap | None = None
+        self._sitemap_json: tuple[int, bytes, str] | None = None
+        self._pages_cache: PagesCache | None = None
+        self._jobs_executor = ThreadPoolExecutor(max_workers=2)
+        self._jobs: dict[str, Future] = {}
+        self._jobs_lock = threading.Lock()
         super().__init__(app, state_provider)
 
     def init_endpoints(self):
@@ -39,6 +58,16 @@ class SitemapController(BaseController):
             view_func=self.request_and_export,
             methods=['POST']
         )
+        self._app.add_url_rule(
+            '/sitemap/start_request_and_export',
+            view_func=self.start_request_and_export,
+            methods=['POST']
+        )
+        self._app.add_url_rule(
+            '/sitemap/job_status/<job_id>',
+            view_func=self.get_job_status,
+            methods=['GET']
+        )
         self._app.add_url_rule(
             '/sitemap/get_page_content/<int:page_id>/<bool:markup>',
             view_func=self.get_page_content,
@@ -60,6 +89,59 @@ class SitemapController(BaseController):
             methods=['POST']
         )
 
+    def get_pages_cache(self) -> PagesCache | None:
+        """
+        Returns the on-disk pages cache configured in the server's state.
+
+        :return: The pages cache, or None if `state.pages_cache_dir` is not set.
+        """
+        cache_dir = self._state.pages_cache_dir
+        if not cache_dir:
+            return None
+        if self._pages_cache is None or self._pages_cache.cache_dir != cache_dir:
+            self._pages_cache = PagesCache(cache_dir)
+        return self._pages_cache
+
+    def get_page_index(self) -> dict[str, Article | Category]:
+        """
+        Returns the page index of the sitemap in the server's state, rebuilding it when the sitemap was replaced.
+
+        :return: The pages of the sitemap keyed by the numbers their URLs end with.
+        """
+        sitemap = self._state.sitemap
+        if sitemap is not self._page_index_sitemap:
+            self._page_index = build_page_index(sitemap)
+            self._page_index_sitemap = sitemap
+        return self._page_index
+
+    def get_sitemap_json(self) -> tuple[bytes, str]:
+        """
+        Returns the serialized sitemap in the server's state.
+
+        The serialized sitemap is cached per state version, so it is only serialized again after the state changed.
+
+        :return: The sitemap as JSON bytes and the ETag of those bytes.
+        """
+        # The version is read before serializing, so a change made meanwhile leaves the cache stale, never wrong
+        version = self._state_provider.version
+        cached = self._sitemap_json
+        if cached is None or cached[0] != version:
+            body = orjson_serializer.dumps(self._state.sitemap)
+            cached = (version, body, hashlib.blake2b(body, digest_size=8).hexdigest())
+            self._sitemap_json = cached
+        return cached[1], cached[2]
+
+    def sitemap_response(self) -> Response:
+        """
+        Builds a JSON response with the serialized sitemap, answering 304 if the client already has it.
+
+        :return: The sitemap response.
+        """
+        body, etag = self.get_sitemap_json()
+        response = json_bytes_response(body, 200)
+        response.set_etag(etag)
+        return response.make_conditional(request)
+
     def set_extractor_options(self):
         """
         Sets the options for extracting the sitemap.
@@ -69,20 +151,21 @@ class SitemapController(BaseController):
 
         :return: JSON response indicating success or an error.
         """
-        options_data = request.get_json()
+        options_data = request.get_data(cache=False)
         if not options_data:
-            return jsonify({'error': 'Invalid or missing JSON data'}), 400
+            return json_response({'error': 'Invalid or missing JSON data'}, 400)
 
         try:
-            extractor_options = ExtractorOptions(**options_data)
+            extractor_options = ExtractorOptions.model_validate_json(options_data)
             self._state.extractor_options = extractor_options
-            return jsonify({
+            self._state_provider.mark_changed()
+            return json_response({
                 'message': 'Extractor options set successfully'
-            }), 200
+            }, 200)
         except ValidationError as e:
-            return jsonify({
+            return json_response({
                 'error': e.errors()
-            }), 400
+            }, 400)
 
     def request_and_export(self):
         """
@@ -93,18 +176,80 @@ class SitemapController(BaseController):
 
         :return: JSON response with the exported sitemap.
         """
-        options = self._state.extractor_options
+        state = self._state
+        options = state.extractor_options
         if not options:
-            return jsonify({'error': 'Extractor options is not set'}), 400
+            return json_response({'error': 'Extractor options is not set'}, 400)
 
-        sitemap = request_sitemap_and_export(
-            self._state.extractor_options,
-            self._state.default_sitemap_export_file
-        )
-        self._state.sitemap = sitemap
-        self._state.extraction_file = self._state.default_sitemap_export_file
+        self.export_sitemap(options, state.default_sitemap_export_file)
+
+        return self.sitemap_response()
 
-        return jsonify(sitemap), 200
+    def export_sitemap(self, options: ExtractorOptions, export_file: str):
+        """
+        Requests the sitemap, exports it, and saves it to the server's state.
+
+        The sitemap is stored in the state that is current once the export finishes,
+        so a state imported while a background export runs does not swallow its result.
+
+        :param options: The options to extract the sitemap with.
+        :param export_file: The file to export the sitemap to.
+        """
+        sitemap = request_sitemap_and_export(options, export_file, self.get_pages_cache())
+        state = self._state
+        state.sitemap = sitemap
+        state.extraction_file = export_file
+        self._state_provider.mark_changed()
+
+    def start_request_and_export(self):
+        """
+        Starts requesting and exporting the sitemap in the background, like `request_and_export`.
+
+        Returns HTTP 400 if options are not set.
+
+        :return: JSON response with the id of the started job, with HTTP 202.
+        """
+        state = self._state
+        if not state.extractor_options:
+            return json_response({'error': 'Extractor options is not set'}, 400)
+
+        job_id = uuid.uuid4().hex
+        job = self._jobs_executor.submit(self.export_sitemap, state.extractor_options, state.default_sitemap_export_file)
+        with self._jobs_lock:
+            self.prune_jobs()
+            self._jobs[job_id] = job
+        return json_response({'job_id': job_id}, 202)
+
+    def prune_jobs(self):
+        """
+        Forgets the oldest finished jobs beyond `MAX_FINISHED_JOBS`, so the job table does not grow without bound.
+        Must be called with `_jobs_lock` held.
+        """
+        finished = [job_id for job_id, job in self._jobs.items() if job.done()]
+        for job_id in finished[:max(0, len(finished) - self.MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    def get_job_status(self, job_id: str):
+        """
+        Returns the status of a job started by `start_request_and_export`.
+
+        Returns HTTP 404 if there is no job with the specified ID.
+
+        :param job_id: The ID of the job.
+        :return: JSON response with the job state ('running', 'done' or 'error') and the error message, if any.
+        """
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return json_response({'error': f"There is no job with id == {job_id}"}, 404)
+
+        if not job.done():
+            return json_response({'state': 'running'}, 200)
+
+        error = job.exception()
+        if error:
+            return json_response({'state': 'error', 'error': str(error)}, 200)
+        return json_response({'state': 'done'}, 200)
 
     def get_sitemap(self):
         """
@@ -117,9 +262,9 @@ class SitemapController(BaseController):
         sitemap = self._state.sitemap
 
         if not sitemap:
-            return jsonify({'error': 'Sitemap is not set'}), 400
+            return json_response({'error': 'Sitemap is not set'}, 400)
 
-        return jsonify(sitemap), 200
+        return self.sitemap_response()
 
     def get_page_content(self, page_id: int, markup: bool):
         """
@@ -133,52 +278,53 @@ class SitemapController(BaseController):
         :param markup: If markup is true, method extracts page with html markup from container, that defined in options
         :return: JSON response with the page content or an error message.
         """
-        sitemap = self._state.sitemap
+        state = self._state
+        sitemap = state.sitemap
         if not isinstance(sitemap, SiteMap):
-            return jsonify({'error': 'Invalid sitemap format'}), 500
+            return json_response({'error': 'Invalid sitemap format'}, 500)
 
         if not sitemap:
-            return jsonify({'error': 'Sitemap is not set'}), 400
+            return json_response({'error': 'Sitemap is not set'}, 400)
 
-        page = find_page_by_id(sitemap, page_id)
+        page = self.get_page_index().get(str(page_id))
 
         if not page:
-            return jsonify({'error': f"There is no page with id == {page_id}"}), 404
+            return json_response({'error': f"There is no page with id == {page_id}"}, 404)
 
         try:
-            parser = ContentParser(page.url, self._state.pages_content_container_selector)
+            parser = ContentParser(page.url, state.pages_content_container_selector,
+                                   pages_cache=self.get_pages_cache())
             result = parser.parse(only_markup=markup)
-            return jsonify(result), 200
+            return json_response(result, 200)
         except Exception as e:
-            return jsonify({'error': str(e)}), 500
+            return json_response({'error': str(e)}, 500)
 
     def fill_sitemap_with_html(self):
-        if not self._state:
-            return jsonify({'error': 'State was not set'}), 400
-
-        if not self._state.sitemap:
-            return jsonify({'error': 'Sitemap is empty'}), 400
+        state = self._state
+        if not state:
+            return json_response({'error': 'State was not set'}, 400)
 
-        def process_category(target_category: Category):
-            for article in target_category.articles:
-                parser = ContentParser(article.url, self._state.pages_content_container_selector)
-                article.html = parser.parse(only_markup=True)
-            for subcategory in target_category.subcategories:
-                process_category(subcategory)
+        if not state.sitemap:
+            return json_response({'error': 'Sitemap is empty'}, 400)
 
-        for category in self._state.sitemap.categories:
-            process_category(category)
+        fill_articles_html(
+            state.sitemap,
+            state.pages_content_container_selector,
+            self.get_pages_cache()
+        )
+        self._state_provider.mark_changed()
 
-        return jsonify(self._state.sitemap), 200
+        return self.sitemap_response()
 
     def get_zipped_sitemap(self):
-        if not self._state:
-            return jsonify({'error': 'State was not set'}), 400
+        state = self._state
+        if not state:
+            return json_response({'error': 'State was not set'}, 400)
 
-        if not self._state.sitemap:
-            return jsonify({'error': 'Sitemap is empty'}), 400
+        if not state.sitemap:
+            return json_response({'error': 'Sitemap is empty'}, 400)
 
-        zipper = SiteMapFS(self._state.default_parsed_data_dir)
-        zipper.save_sitemap(self._state.sitemap)
-        zipper.save_as_zip(self._state.sitemap, 'extraction.7zip')
+        zipper = SiteMapFS(state.default_parsed_data_dir)
+        zipper.save_sitemap(state.sitemap)
+        zipper.save_as_zip(state.sitemap, 'extraction.7zip')
         return send_file('extraction.7zip')
\ No newline at end of file
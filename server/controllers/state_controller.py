@@ -1,6 +1,8 @@
-from flask import Flask, jsonify, request
+from flask import Flask, request
 from pydantic import ValidationError
 
+from serialization import orjson_serializer
+from serialization.json_provider import json_bytes_response, json_response
 from server.state import ServerState, ServerStateProvider
 from server.controllers.controller_base import BaseController
 
@@ -13,6 +15,7 @@ class StateController(BaseController):
         :param app: Flask application where the endpoints will be registered.
         :param state_provider: Reactive state provider.
         """
+        self._export_cache: tuple[int, bytes] | None = None
         super().__init__(app, state_provider)
 
     def init_endpoints(self):
@@ -30,9 +33,14 @@ class StateController(BaseController):
         """
         Exports the current server state.
 
+        The serialized state is cached per state version, so repeated exports of an unchanged state are not re-serialized.
+
         :return: JSON response with the serialized server state.
         """
-        return jsonify(self._state.model_dump())  # Use model_dump if state supports it
+        version = self._state_provider.version
+        if self._export_cache is None or self._export_cache[0] != version:
+            self._export_cache = (version, orjson_serializer.dumps(self._state))
+        return json_bytes_response(self._export_cache[1], 200)
 
     def import_state(self):
         """
@@ -47,16 +55,16 @@ class StateController(BaseController):
 
         :return: JSON response with a success or error message.
         """
-        state_data = request.get_json()
+        state_data = request.get_data(cache=False)
         if not state_data:
-            return jsonify({'error': 'Invalid or missing JSON data'}), 400
+            return json_response({'error': 'Invalid or missing JSON data'}, 400)
 
         try:
-            new_state = ServerState(**state_data)
+            new_state = ServerState.model_validate_json(state_data)
             self._state_provider.update_state(new_state)
 
-            return jsonify({'message': 'State imported successfully'}), 200
+            return json_response({'message': 'State imported successfully'}, 200)
         except ValidationError as e:
-            return jsonify({'error': e.errors()}), 400
+            return json_response({'error': e.errors()}, 400)
         except Exception as e:
-            return jsonify({'error': str(e)}), 500
\ No newline at end of file
+            return json_response({'error': str(e)}, 500)
\ No newline at end of file
@@ -1,6 +1,6 @@
-import json
 import os
 from pathlib import Path
+
 from server.state import ServerState
 
 
@@ -40,10 +40,7 @@ class InitConfiguration:
 
         Raises:
             FileNotFoundError: If the file does not exist.
-            JSONDecodeError: If the file content is not valid JSON.
-            ValidationError: If the JSON does not match the `ServerState` schema.
+            ValidationError: If the file content is not valid JSON or does not match the `ServerState` schema.
         """
-        with open(config_file_path, 'r', encoding='utf-8') as file:
-            config_json = json.load(file)
-        state: ServerState = ServerState(**config_json)
+        state: ServerState = ServerState.model_validate_json(Path(config_file_path).read_bytes())
         return state
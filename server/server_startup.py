@@ -1,12 +1,15 @@
+import gc
+import os
 from typing import List, Type
 
 from werkzeug.routing import BaseConverter
 
 from flask import Flask
-from flask.json.provider import DefaultJSONProvider
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from waitress import serve
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from server.controllers.controller_base import BaseController
 from server.init_state import InitConfiguration
@@ -15,9 +18,12 @@ from server.state import ServerStateProvider
 
 
 class RunSettings(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     host: str
     port: int
     debug: bool
+    threads: int = 32
 
     @staticmethod
     def get_default_dev():
@@ -35,6 +41,18 @@ class RunSettings(BaseModel):
             debug=False,
         )
 
+    @staticmethod
+    def get_from_env():
+        """
+        Picks the run settings from the `SERVER_MODE` environment variable.
+
+        Returns:
+            RunSettings: The production settings if `SERVER_MODE` is 'prod', the development settings otherwise.
+        """
+        if os.getenv('SERVER_MODE', 'dev').lower() == 'prod':
+            return RunSettings.get_default_prod()
+        return RunSettings.get_default_dev()
+
 
 class Startup:
     """
@@ -65,16 +83,23 @@ class Startup:
         init_controllers() -> "Startup":
             Initializes all registered controllers by invoking their `init_endpoints` method.
 
-        add_json_provider(provider: DefaultJSONProvider) -> "Startup":
+        add_json_provider(provider: JSONProvider) -> "Startup":
             Sets a custom JSON provider for the Flask application.
 
         run_app(settings: RunSettings = RunSettings.get_default_prod()) -> None:
-            Starts the Flask application with the specified run settings.
+            Starts the Flask application with the specified run settings, on the development server in
+            debug mode and on a multithreaded waitress server otherwise.
     """
 
     app: Flask
     state_provider: ServerStateProvider
-    controllers: List[BaseController] = []
+    controllers: List[BaseController]
+
+    def __init__(self):
+        """
+        Initializes the startup with its own, initially empty, list of controllers.
+        """
+        self.controllers = []
 
     def init_server(self, name: str = "") -> "Startup":
         """
@@ -166,25 +191,35 @@ class Startup:
         """
         Starts the Flask application with the specified run settings.
 
+        The endpoints mostly wait on outbound page fetches, so outside of debug mode the app is served
+        by waitress with a pool of `settings.threads` worker threads, letting concurrent requests overlap.
+
         Args:
-            settings (RunSettings): The settings for running the application (host, port, debug).
+            settings (RunSettings): The settings for running the application (host, port, debug, threads).
 
         Returns:
             None
         """
-        self.app.run(
-            host=settings.host,
-            port=settings.port,
-            debug=settings.debug,
-        )
+        # The configuration and the loaded state live for the whole process; moving them to the permanent
+        # generation keeps the garbage collector from rescanning them on every collection
+        gc.freeze()
+
+        if settings.debug:
+            self.app.run(
+                host=settings.host,
+                port=settings.port,
+                debug=settings.debug,
+            )
+            return
 
+        serve(self.app, host=settings.host, port=settings.port, threads=settings.threads)
 
-    def add_json_provider(self, provider: DefaultJSONProvider) -> "Startup":
+    def add_json_provider(self, provider: JSONProvider) -> "Startup":
         """
         Sets a custom JSON provider for the Flask application.
 
         Args:
-            provider (DefaultJSONProvider): The custom JSON provider to use.
+            provider (JSONProvider): The custom JSON provider to use.
 
         Returns:
             Startup: The current instance for method chaining.
@@ -1,6 +1,7 @@
+from typing import Callable
+
 from pydantic import BaseModel
-from reactivex import Observable
-from reactivex.subject import BehaviorSubject
+
 from core.sitemap_extraction.sitemap import SiteMap
 from core.sitemap_extraction.sitemapExtractor import ExtractorOptions
 
@@ -17,6 +18,7 @@ class ServerState(BaseModel):
         pages_content_container_selector (str): CSS selector for the main content container on pages.
         default_parsed_data_dir (str): Default directory for storing parsed data. Defaults to 'data'.
         parsed_data_dir (str | None): Directory for storing parsed data, defaults to `default_parsed_data_dir`.
+        pages_cache_dir (str | None): Directory for the on-disk cache of fetched pages. Caching is disabled if None.
     """
     extractor_options: ExtractorOptions | None = None
     extraction_file: str | None = None
@@ -25,50 +27,70 @@ class ServerState(BaseModel):
     pages_content_container_selector: str = 'page_text'
     default_parsed_data_dir: str = 'data'
     parsed_data_dir: str | None = default_parsed_data_dir
+    pages_cache_dir: str | None = None
 
 
 class ServerStateProvider:
     """
-    Manages the state of the server using a reactive pattern.
+    Holds the current server state and notifies listeners when it is replaced.
+
+    The state is a plain attribute, so reading it is a single attribute lookup.
 
     Attributes:
-        _server_state (BehaviorSubject[ServerState]): Reactive subject holding the current server state.
+        current (ServerState): The current server state.
+        version (int): Incremented whenever the state is replaced or modified, so derived data can be cached per version.
+        _listeners (list[Callable[[ServerState], None]]): Callbacks invoked with every new state.
 
     Methods:
-        as_observable() -> Observable[ServerState]:
-            Returns the current server state as an observable for reactive updates.
+        subscribe(listener: Callable[[ServerState], None]):
+            Registers a callback that is invoked with every new state.
 
         update_state(new_state: ServerState):
-            Updates the server state and notifies all observers.
+            Updates the server state and notifies all listeners.
+
+        mark_changed():
+            Records that the current state was modified in place.
     """
 
-    _server_state: BehaviorSubject[ServerState]
+    current: ServerState
+    version: int
+    _listeners: list[Callable[[ServerState], None]]
 
-    def __init__(self, init_state: ServerState = ServerState()):
+    def __init__(self, init_state: ServerState | None = None):
         """
         Initializes the server state provider with an initial state.
 
         Args:
-            init_state (ServerState): The initial state of the server. Defaults to a new `ServerState` instance.
+            init_state (ServerState, optional): The initial state of the server. Defaults to a new `ServerState` instance.
         """
-        self._server_state = BehaviorSubject(init_state)
+        # A fresh default per provider, since controllers modify the state in place
+        self.current = init_state if init_state is not None else ServerState()
+        self.version = 0
+        self._listeners = []
 
-    def as_observable(self) -> Observable[ServerState]:
+    def subscribe(self, listener: Callable[[ServerState], None]):
         """
-        Returns the current server state as an observable.
-
-        This allows observers to subscribe and react to state updates.
+        Registers a callback that is invoked with every new state.
 
-        Returns:
-            Observable[ServerState]: An observable stream of the server state.
+        Args:
+            listener (Callable[[ServerState], None]): The callback to register.
         """
-        return self._server_state
+        self._listeners.append(listener)
 
     def update_state(self, new_state: ServerState):
         """
-        Updates the server state and notifies all observers.
+        Updates the server state and notifies all listeners.
 
         Args:
             new_state (ServerState): The new state to apply.
         """
-        self._server_state.on_next(new_state)
+        self.current = new_state
+        self.version += 1
+        for listener in self._listeners:
+            listener(new_state)
+
+    def mark_changed(self):
+        """
+        Records that the current state was modified in place, invalidating data cached for the previous version.
+        """
+        self.version += 1
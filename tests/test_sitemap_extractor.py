@@ -0,0 +1,63 @@
+import unittest
+from collections import Counter
+
+from core.sitemap_extraction.sitemapExtractor import ExtractorOptions, SiteMapExtractor
+
+ROOT_URL = 'https://example.com/'
+
+PAGES = {
+    ROOT_URL: '''
+        <a class="gsection" href="/sections/view/10">Раздел 10</a>
+        <a class="gsection" href="/sections/view/20">Раздел 20</a>
+    ''',
+    'https://example.com/sections/view/10': '<a class="gsection" href="/sections/view/11">Sub 11</a>',
+    'https://example.com/sections/view/20': '<a class="gsection" href="/sections/view/11">Sub 11 again</a>',
+    'https://example.com/sections/view/11': '''
+        <a class="gsection" href="/sections/view/10">Back to 10</a>
+        <a class="gsection" href="/sections/view/12">Sub 12</a>
+    ''',
+    'https://example.com/sections/view/12': '<a class="page" href="/pages/view/5"><span class="title">Page 5</span></a>',
+}
+
+
+class DiamondSiteMapExtractor(SiteMapExtractor):
+    """
+    Serves the pages of a diamond-shaped category graph, where two parents link to one shared subtree.
+    """
+    def __init__(self):
+        super().__init__(ExtractorOptions(
+            root_url=ROOT_URL,
+            excluded_urls=[],
+            category_tag='a',
+            category_selectors=['gsection'],
+            article_tag='a',
+            article_selectors=['page'],
+        ))
+        self.fetches = Counter()
+
+    def fetch_page(self, url: str) -> str:
+        self.fetches[url] += 1
+        return PAGES[url]
+
+
+class ExtractCategoriesRecursiveTest(unittest.TestCase):
+    def test_shared_subtree_is_kept_under_both_parents(self):
+        extractor = DiamondSiteMapExtractor()
+        sitemap = extractor.extract_site_map()
+
+        first, second = sitemap.categories
+        for parent, name in ((first, 'Sub 11'), (second, 'Sub 11 again')):
+            shared, = parent.subcategories
+            self.assertEqual(shared.name, name)
+            self.assertEqual(shared.url, 'https://example.com/sections/view/11')
+            self.assertEqual(shared.articles, [])
+            leaf, = shared.subcategories
+            self.assertEqual(leaf.url, 'https://example.com/sections/view/12')
+            self.assertEqual([article.url for article in leaf.articles], ['https://example.com/pages/view/5'])
+
+        self.assertIsNot(first.subcategories[0], second.subcategories[0])
+        self.assertEqual(set(extractor.fetches.values()), {1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterator
+
+import httpx
+
+from core.content_parsing.content_parser import ContentParser
+from core.sitemap_extraction.article import Article
+from core.sitemap_extraction.sitemap import SiteMap
+from utils.pages_cache import PagesCache
+from utils.rate_limiting import DEFAULT_DOMAIN_DELAY, DomainRateLimiter
+from utils.sitemap_navigation import iter_pages
+
+_parse_pool: ProcessPoolExecutor | None = None
+_parse_pool_lock = threading.Lock()
+
+
+def iter_articles(sitemap: SiteMap) -> Iterator[Article]:
+    """
+    Yields every article of the sitemap, in the order `iter_pages` walks them.
+
+    Args:
+        sitemap (SiteMap): The sitemap to walk.
+
+    Yields:
+        Article: The articles of all categories and subcategories.
+    """
+    return (page for page in iter_pages(sitemap) if isinstance(page, Article))
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """
+    Returns the process pool the markup extraction runs in, creating it on first use.
+
+    The pool is shared by all fill calls of the process, so its spawned workers are started only once.
+
+    Returns:
+        ProcessPoolExecutor: The shared parsing pool, with one worker per CPU.
+    """
+    global _parse_pool
+    with _parse_pool_lock:
+        # A pool whose worker died is unusable for good, so it is replaced rather than reused
+        if _parse_pool is None or getattr(_parse_pool, '_broken', False):
+            # Spawn rather than fork, since the server process runs several threads
+            _parse_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+        return _parse_pool
+
+
+def extract_markup(url: str, html_content: str, container_selector: str) -> str:
+    """
+    Extracts the markup of the content container from already fetched page HTML.
+
+    Only strings cross the process boundary, so this can run in a process pool.
+
+    Args:
+        url (str): The URL of the page.
+        html_content (str): The HTML of the page.
+        container_selector (str): The CSS selector for the content container.
+
+    Returns:
+        str: The markup of the content container.
+    """
+    parser = ContentParser(url, container_selector)
+    parser.html_content = html_content
+    return parser.parse(only_markup=True)
+
+
+async def fill_article_html(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, rate_limiter: DomainRateLimiter,
+                            article: Article, container_selector: str, pages_cache: PagesCache | None = None,
+                            parse_pool: Executor | None = None):
+    """
+    Fetches an article's page and stores the markup of its content container in `article.html`.
+
+    Failures are logged and leave the article unchanged.
+
+    Args:
+        client (httpx.AsyncClient): The client used to fetch the page.
+        semaphore (asyncio.Semaphore): Limits the number of concurrent fetches.
+        rate_limiter (DomainRateLimiter): Spaces out requests to the same domain.
+        article (Article): The article to fill.
+        container_selector (str): The CSS selector for the content container.
+        pages_cache (PagesCache, optional): On-disk cache of fetched pages.
+        parse_pool (Executor, optional): Executor the markup extraction runs in. Defaults to the event loop thread.
+    """
+    parser = ContentParser(article.url, container_selector, pages_cache=pages_cache)
+    try:
+        async with semaphore:
+            await parser.fetch_content_async(client, rate_limiter)
+        if parse_pool is None:
+            article.html = parser.parse(only_markup=True)
+        else:
+            article.html = await asyncio.get_running_loop().run_in_executor(
+                parse_pool, extract_markup, article.url, parser.html_content, container_selector
+            )
+    except Exception as e:
+        print(f"Failed to fill article {article.url}: {e}")
+
+
+async def fill_articles_html_async(sitemap: SiteMap, container_selector: str,
+                                   pages_cache: PagesCache | None = None, max_concurrency: int = 20,
+                                   domain_delay: float = DEFAULT_DOMAIN_DELAY):
+    """
+    Concurrently fills `html` of every article in the sitemap with its page's container markup.
+
+    Pages are fetched on the event loop, while the CPU-bound markup extraction runs in the shared
+    process pool from `get_parse_pool` so it is not serialized by the GIL.
+
+    Args:
+        sitemap (SiteMap): The sitemap whose articles are filled.
+        container_selector (str): The CSS selector for the content container.
+        pages_cache (PagesCache, optional): On-disk cache of fetched pages.
+        max_concurrency (int): The maximum number of pages fetched at once.
+        domain_delay (float): The minimum interval between two requests to one domain, in seconds.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    rate_limiter = DomainRateLimiter(domain_delay)
+    limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+    parse_pool = get_parse_pool()
+    async with httpx.AsyncClient(limits=limits, timeout=30.0, follow_redirects=True) as client:
+        await asyncio.gather(*(
+            fill_article_html(client, semaphore, rate_limiter, article, container_selector, pages_cache, parse_pool)
+            for article in iter_articles(sitemap)
+        ))
+
+
+def fill_articles_html(sitemap: SiteMap, container_selector: str,
+                       pages_cache: PagesCache | None = None, max_concurrency: int = 20,
+                       domain_delay: float = DEFAULT_DOMAIN_DELAY):
+    """
+    Fills `html` of every article in the sitemap with its page's container markup.
+
+    Args:
+        sitemap (SiteMap): The sitemap whose articles are filled.
+        container_selector (str): The CSS selector for the content container.
+        pages_cache (PagesCache, optional): On-disk cache of fetched pages.
+        max_concurrency (int): The maximum number of pages fetched at once.
+        domain_delay (float): The minimum interval between two requests to one domain, in seconds.
+    """
+    asyncio.run(fill_articles_html_async(sitemap, container_selector, pages_cache, max_concurrency, domain_delay))
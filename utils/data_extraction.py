@@ -1,4 +1,12 @@
 from bs4 import Tag
 
+try:
+    import lxml  # noqa: F401
+    BS4_PARSER = 'lxml'
+except ImportError:
+    # Fall back to the pure-Python parser if the C-backed lxml is not installed
+    BS4_PARSER = 'html.parser'
+
+
 def extract_text(element: Tag) -> str:
-    return ''.join(element.stripped_strings).strip()
\ No newline at end of file
+    return ''.join(element.stripped_strings).strip()
@@ -0,0 +1,29 @@
+import os
+import tempfile
+
+# mkstemp creates files readable by the owner only; read the umask once so written files get the usual mode
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def write_bytes_atomic(path: str | os.PathLike, data: bytes):
+    """
+    Writes bytes to a file atomically.
+
+    The data is written to a temporary file in the same directory, which then replaces the target
+    with a single rename, so readers and interrupted runs never see a partially written file.
+
+    Args:
+        path (str | os.PathLike): The path of the file to write.
+        data (bytes): The content to write.
+    """
+    path = os.fspath(path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,53 @@
+import re
+import codecs
+
+HEADER_CHARSET_PATTERN = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+# Browsers only look for a <meta> charset in the first 1024 bytes of a page
+META_SNIFF_LENGTH = 1024
+DEFAULT_ENCODING = 'utf-8'
+
+
+def detect_html_encoding(content: bytes, content_type: str | None = None) -> str:
+    """
+    Detects the encoding of an HTML page, the way a browser would: the charset of the `Content-Type` header wins,
+    then a `<meta>` charset declared near the start of the page, then UTF-8.
+
+    Args:
+        content (bytes): The raw HTML of the page.
+        content_type (str, optional): The `Content-Type` header of the response.
+
+    Returns:
+        str: The name of a known encoding.
+    """
+    candidates = []
+    if content_type:
+        match = HEADER_CHARSET_PATTERN.search(content_type)
+        if match:
+            candidates.append(match.group(1))
+    match = META_CHARSET_PATTERN.search(content[:META_SNIFF_LENGTH])
+    if match:
+        candidates.append(match.group(1).decode('ascii'))
+
+    for candidate in candidates:
+        try:
+            return codecs.lookup(candidate).name
+        except LookupError:
+            continue
+    return DEFAULT_ENCODING
+
+
+def decode_html(content: bytes, content_type: str | None = None) -> str:
+    """
+    Decodes the raw HTML of a page with its detected encoding.
+
+    Undecodable bytes are replaced rather than failing the whole page.
+
+    Args:
+        content (bytes): The raw HTML of the page.
+        content_type (str, optional): The `Content-Type` header of the response.
+
+    Returns:
+        str: The decoded HTML.
+    """
+    return content.decode(detect_html_encoding(content, content_type), errors='replace')
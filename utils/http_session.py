@@ -0,0 +1,68 @@
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.html_decoding import decode_html
+
+REQUEST_TIMEOUT = 10
+
+
+def create_session(pool_connections: int = 32, pool_maxsize: int = 64, retries: int = 3) -> requests.Session:
+    """
+    Creates a `requests.Session` with connection pooling, keep-alive and retries.
+
+    Args:
+        pool_connections (int): The number of host connection pools to cache.
+        pool_maxsize (int): The maximum number of connections kept per host pool.
+        retries (int): The number of retries for failed requests.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=retries, backoff_factor=0.3)
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def response_html(response: requests.Response | httpx.Response) -> str:
+    """
+    Checks the status of a response and decodes its body as HTML.
+
+    Args:
+        response (requests.Response | httpx.Response): The response of a page request.
+
+    Returns:
+        str: The page HTML, decoded with the charset the response or the page declares.
+
+    Raises:
+        HTTPError: If the request failed.
+    """
+    response.raise_for_status()
+    return decode_html(response.content, response.headers.get('Content-Type'))
+
+
+def fetch_html(session: requests.Session, url: str) -> str:
+    """
+    Fetches a page and decodes its HTML.
+
+    Args:
+        session (requests.Session): The HTTP session to use.
+        url (str): The URL of the page.
+
+    Returns:
+        str: The page HTML.
+
+    Raises:
+        HTTPError: If the HTTP request fails.
+    """
+    return response_html(session.get(url, timeout=REQUEST_TIMEOUT))
+
+
+SESSION = create_session()
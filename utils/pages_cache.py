@@ -0,0 +1,93 @@
+import os
+import gzip
+import time
+import zlib
+import hashlib
+
+import requests
+
+from utils.file_writing import write_bytes_atomic
+from utils.http_session import fetch_html
+
+
+class PagesCache:
+    """
+    A content-addressed on-disk cache of fetched HTML pages, keyed by a hash of the page URL.
+
+    Attributes:
+        cache_dir (str): Directory where the gzipped pages are stored.
+        expire_after (float | None): Lifetime of a cached page in seconds, or None to never expire.
+    """
+    def __init__(self, cache_dir: str, expire_after: float | None = 3600):
+        self.cache_dir = cache_dir
+        self.expire_after = expire_after
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get_path(self, url: str) -> str:
+        """
+        Returns the path of the cache file for a URL.
+
+        Args:
+            url (str): The page URL.
+
+        Returns:
+            str: The path of the cache file.
+        """
+        key = hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.html.gz")
+
+    def get(self, url: str) -> str | None:
+        """
+        Returns the cached HTML for a URL.
+
+        Args:
+            url (str): The page URL.
+
+        Returns:
+            str | None: The cached HTML, or None if it is missing, expired or corrupt. Corrupt entries are deleted.
+        """
+        path = self.get_path(url)
+        try:
+            if self.expire_after is not None and time.time() - os.path.getmtime(path) > self.expire_after:
+                return None
+            with gzip.open(path, 'rt', encoding='utf-8') as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, zlib.error, UnicodeDecodeError):
+            # Unreadable, truncated or not stored as UTF-8 text: drop the entry and fetch the page again
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def set(self, url: str, html: str):
+        """
+        Stores the HTML for a URL.
+
+        Args:
+            url (str): The page URL.
+            html (str): The page HTML.
+        """
+        write_bytes_atomic(self.get_path(url), gzip.compress(html.encode('utf-8')))
+
+    def fetch(self, session: requests.Session, url: str) -> str:
+        """
+        Returns the HTML for a URL from the cache, fetching and caching it on a miss.
+
+        Args:
+            session (requests.Session): The HTTP session used on a cache miss.
+            url (str): The page URL.
+
+        Returns:
+            str: The page HTML.
+
+        Raises:
+            HTTPError: If the HTTP request fails.
+        """
+        html = self.get(url)
+        if html is None:
+            html = fetch_html(session, url)
+            self.set(url, html)
+        return html
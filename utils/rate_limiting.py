@@ -0,0 +1,36 @@
+import asyncio
+from urllib.parse import urlparse
+
+DEFAULT_DOMAIN_DELAY = 0.2
+
+
+class DomainRateLimiter:
+    """
+    Spaces out requests to the same domain by a minimum interval, while requests to
+    different domains are not delayed by each other.
+
+    Attributes:
+        min_interval (float): The minimum interval between two requests to one domain, in seconds.
+    """
+    def __init__(self, min_interval: float = DEFAULT_DOMAIN_DELAY):
+        self.min_interval = min_interval
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._last_request: dict[str, float] = {}
+
+    async def wait(self, url: str):
+        """
+        Waits until a request to the URL's domain is allowed.
+
+        Args:
+            url (str): The URL about to be requested.
+        """
+        domain = urlparse(url).netloc
+        lock = self._locks.setdefault(domain, asyncio.Lock())
+        async with lock:
+            loop = asyncio.get_running_loop()
+            last_request = self._last_request.get(domain)
+            if last_request is not None:
+                delay = last_request + self.min_interval - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            self._last_request[domain] = loop.time()
@@ -2,27 +2,39 @@ import os
 import re
 
 import shutil
-import json
 import hashlib
+import functools
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from transliterate import translit
 
 from core.content_parsing.image_parser import HTMLImageParser
+from serialization import orjson_serializer
+from utils.file_writing import write_bytes_atomic
 from core.sitemap_extraction.sitemap import SiteMap
 from core.sitemap_extraction.article import Article
 from core.sitemap_extraction.category import Category
 
 
+@functools.lru_cache(maxsize=4096)
+def _hash_name(name: str) -> str:
+    return hashlib.md5(name.encode('utf-8')).hexdigest()[:16]  # Use the first 16 chars for brevity
+
+
 class SiteMapFS:
     """
     A class to save a sitemap and its articles' images to the file system with safe, hashed paths.
     """
-    def __init__(self, base_dir: str):
+    def __init__(self, base_dir: str, max_workers: int = 16):
         self.base_dir = base_dir
+        self.max_workers = max_workers
 
     def __hash_path_name(self, name: str) -> str:
         """
-        Generates a short and unique hash for a given name.
+        Generates a short and unique hash for a given name. Results are memoized,
+        since the same name is hashed several times while saving a category.
 
         Args:
             name (str): The original name to hash.
@@ -30,13 +42,16 @@ class SiteMapFS:
         Returns:
             str: A hashed name safe for use in file paths.
         """
-        hash_digest = hashlib.md5(name.encode('utf-8')).hexdigest()[:16]  # Use the first 16 chars for brevity
-        return hash_digest
+        return _hash_name(name)
 
     def save_article(self, article: Article, article_dir: str):
         """
         Saves an article's HTML and associated images to a hashed directory.
 
+        A SHA-1 of the article's HTML is stored next to the saved file; if it matches on a later save,
+        the article is unchanged and its images are neither re-downloaded nor its file rewritten.
+        The hash is only stored once every image has been downloaded, so failed images are retried.
+
         Args:
             article (Article): The article object to save.
             article_dir (str): The directory where the article should be saved.
@@ -44,44 +59,91 @@ class SiteMapFS:
         hashed_article_dir = os.path.join(article_dir, self.__hash_path_name(article.title))
         os.makedirs(hashed_article_dir, exist_ok=True)
         image_dir = os.path.join(hashed_article_dir, 'images')
+        article_path = Path(hashed_article_dir, f"{self.__hash_path_name(article.title)}")
+        hash_path = article_path.with_name(f"{article_path.name}.sha1")
+
+        html = article.html.encode('utf-8') if isinstance(article.html, str) else article.html
+        html_hash = hashlib.sha1(html).hexdigest()
+        if article_path.exists() and hash_path.exists() and hash_path.read_text(encoding='ascii') == html_hash:
+            print(f"Article is unchanged, skipping: {article_path}")
+            return
 
         # Update image links and save HTML
-        updated_html = HTMLImageParser.update_image_links(article, image_dir)
-        article_path = os.path.join(hashed_article_dir, f"{self.__hash_path_name(article.title)}")
-        with open(article_path, 'w', encoding='utf-8') as file:
-            file.write(updated_html)
+        updated_html, images_saved = HTMLImageParser.rewrite_image_links(article, image_dir)
+        write_bytes_atomic(article_path, updated_html.encode('utf-8'))
+        if images_saved:
+            write_bytes_atomic(hash_path, html_hash.encode('ascii'))
+        else:
+            # Leave no hash behind so the missing images are retried on the next save
+            hash_path.unlink(missing_ok=True)
         print(f"Saved article with updated links: {article_path}")
 
-    def save_category(self, category: Category, parent_dir: str):
+    def save_articles(self, articles: list[tuple[Article, str]]):
+        """
+        Saves articles concurrently using a thread pool.
+
+        A failure to save one article is logged and does not abort the others.
+
+        Args:
+            articles (list[tuple[Article, str]]): Pairs of articles and the directories to save them in.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                pool.submit(self.save_article, article, article_dir): article
+                for article, article_dir in articles
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Failed to save article {futures[future].url}: {e}")
+
+    def save_category(self, category: Category, parent_dir: str,
+                      pending_articles: list[tuple[Article, str]] | None = None):
         """
         Saves a category and its contents to hashed directories.
 
         Args:
             category (Category): The category object to save.
             parent_dir (str): The parent directory where the category should be saved.
+            pending_articles (list[tuple[Article, str]], optional): If given, articles are collected here
+                to be saved later instead of being saved immediately.
         """
-        hashed_category_dir = os.path.join(parent_dir, self.__hash_path_name(category.name))
-        os.makedirs(hashed_category_dir, exist_ok=True)
-        print(f"Processing category: {hashed_category_dir}")
-
-        for article in category.articles:
-            self.save_article(article, hashed_category_dir)
-
-        subcategories = []
-        for subcategory in category.subcategories:
-            subcategories.append(self.save_category(subcategory, hashed_category_dir))
-
-        return {
-            "name": category.name,
-            "path": hashed_category_dir,
-            "subcategories": subcategories,
-            "articles": [
-                {
-                    "title": article.title,
-                    "path": os.path.join(hashed_category_dir, f"{self.__hash_path_name(article.title)}", f"{self.__hash_path_name(article.title)}")
-                } for article in category.articles
-            ]
-        }
+        # Walk the subtree with an explicit worklist instead of recursion, attaching each
+        # category's structure to its parent's before the children are processed
+        root_structure = None
+        worklist = deque([(category, parent_dir, None)])
+        while worklist:
+            current, current_parent_dir, parent_structure = worklist.popleft()
+            hashed_category_dir = os.path.join(current_parent_dir, self.__hash_path_name(current.name))
+            os.makedirs(hashed_category_dir, exist_ok=True)
+            print(f"Processing category: {hashed_category_dir}")
+
+            for article in current.articles:
+                if pending_articles is None:
+                    self.save_article(article, hashed_category_dir)
+                else:
+                    pending_articles.append((article, hashed_category_dir))
+
+            structure = {
+                "name": current.name,
+                "path": hashed_category_dir,
+                "subcategories": [],
+                "articles": [
+                    {
+                        "title": article.title,
+                        "path": os.path.join(hashed_category_dir, f"{self.__hash_path_name(article.title)}", f"{self.__hash_path_name(article.title)}")
+                    } for article in current.articles
+                ]
+            }
+            if parent_structure is None:
+                root_structure = structure
+            else:
+                parent_structure["subcategories"].append(structure)
+
+            worklist.extend((subcategory, hashed_category_dir, structure) for subcategory in current.subcategories)
+
+        return root_structure
 
     def save_sitemap(self, sitemap: SiteMap):
         """
@@ -95,13 +157,15 @@ class SiteMapFS:
         os.makedirs(hashed_root_dir, exist_ok=True)
 
         sitemap_structure = []
+        pending_articles: list[tuple[Article, str]] = []
         for category in sitemap.categories:
-            sitemap_structure.append(self.save_category(category, hashed_root_dir))
+            sitemap_structure.append(self.save_category(category, hashed_root_dir, pending_articles))
+
+        self.save_articles(pending_articles)
 
         # Save sitemap index
         index_path = os.path.join(hashed_root_dir, 'sitemap_index.json')
-        with open(index_path, 'w', encoding='utf-8') as index_file:
-            json.dump(sitemap_structure, index_file, indent=4, ensure_ascii=False)
+        write_bytes_atomic(index_path, orjson_serializer.dumps(sitemap_structure, indent=True))
         print(f"Sitemap index saved at: {index_path}")
 
     def save_as_zip(self, sitemap: SiteMap, zip_filename: str):
@@ -1,34 +1,38 @@
 from core.sitemap_extraction.sitemapExtractor import SiteMapExtractor, ExtractorOptions
 from core.sitemap_extraction.sitemap import SiteMap
+from utils.pages_cache import PagesCache
 
 
-def request_sitemap(options: ExtractorOptions) -> SiteMap:
+def request_sitemap(options: ExtractorOptions, pages_cache: PagesCache | None = None) -> SiteMap:
     """
     Loads a sitemap from the URL specified in the options.
 
     Args:
         options (ExtractorOptions): Configuration settings for the `SiteMapExtractor`.
+        pages_cache (PagesCache, optional): On-disk cache of fetched pages.
 
     Returns:
         SiteMap: The extracted sitemap.
     """
-    map_extractor = SiteMapExtractor(options)
+    map_extractor = SiteMapExtractor(options, pages_cache=pages_cache)
     sitemap: SiteMap = map_extractor.extract_site_map()
     return sitemap
 
 
-def request_sitemap_and_export(options: ExtractorOptions, file_name: str) -> SiteMap:
+def request_sitemap_and_export(options: ExtractorOptions, file_name: str,
+                               pages_cache: PagesCache | None = None) -> SiteMap:
     """
     Loads a sitemap from the URL specified in the options and exports it to a JSON file.
 
     Args:
         options (ExtractorOptions): Configuration settings for the `SiteMapExtractor`.
         file_name (str): The name of the file to export the sitemap to.
+        pages_cache (PagesCache, optional): On-disk cache of fetched pages.
 
     Returns:
         SiteMap: The extracted sitemap.
     """
-    map_extractor = SiteMapExtractor(options)
+    map_extractor = SiteMapExtractor(options, pages_cache=pages_cache)
     sitemap: SiteMap = map_extractor.extract_site_map()
     map_extractor.export_results(sitemap, file_name)
     return sitemap
@@ -1,13 +1,55 @@
+import re
+from typing import Iterable, Iterator
+
 from core.sitemap_extraction.article import Article
 from core.sitemap_extraction.category import Category
 from core.sitemap_extraction.sitemap import SiteMap
 
+# The page number closing a URL, optionally followed by a trailing slash or an .html/.htm extension
+PAGE_ID_PATTERN = re.compile(r'(\d+)(?:/|\.html?)?$')
+
+
+def iter_pages(site_map: SiteMap) -> Iterator[Article | Category]:
+    """
+    Yields the categories and articles of the `SiteMap` in depth-first order, walking with an explicit stack.
+
+    Each category is yielded before its articles, which come before its subcategories.
+
+    Args:
+        site_map (SiteMap): The `SiteMap` object to walk.
+
+    Yields:
+        Article | Category: The pages of the sitemap.
+    """
+    stack = list(reversed(site_map.categories))
+    while stack:
+        category = stack.pop()
+        yield category
+        yield from category.articles
+        stack.extend(reversed(category.subcategories))
+
+
+def get_page_id(url: str) -> str | None:
+    """
+    Extracts the number a page URL ends with, e.g. '107' for '.../sections/view/107'.
+
+    Args:
+        url (str): The page URL.
+
+    Returns:
+        str | None: The digits of the page number, or None if the URL does not end with a number.
+    """
+    match = PAGE_ID_PATTERN.search(url)
+    return match.group(1) if match else None
+
 
 def find_page_by_id(site_map: SiteMap, suffix_number: int) -> Article | Category | None:
     """
     Searches for an article or category in the `SiteMap` whose URL ends with the specified number.
 
-    This function performs a recursive search through the categories and their subcategories, as well as their associated articles.
+    The whole number closing the URL must match, so 7 finds '.../view/7' but not '.../view/107'.
+    This function walks the categories and their subcategories, as well as their associated articles, and returns
+    the first match.
 
     Args:
         site_map (SiteMap): The `SiteMap` object to search within.
@@ -24,23 +66,44 @@ def find_page_by_id(site_map: SiteMap, suffix_number: int) -> Article | Category
     if not hasattr(site_map, 'categories'):
         raise ValueError("SiteMap object does not have 'categories' attribute.")
 
-    suffix_str = str(suffix_number)
+    page_id = str(suffix_number)
+    return next((page for page in iter_pages(site_map) if get_page_id(page.url) == page_id), None)
+
+
+def build_page_index(site_map: SiteMap) -> dict[str, Article | Category]:
+    """
+    Builds an index of the articles and categories in the `SiteMap` by the numbers their URLs end with.
+
+    Every page is registered under the number its URL ends with, walking the tree in the same order as
+    `find_page_by_id`, so `index.get(str(suffix_number))` returns the same page as
+    `find_page_by_id(site_map, suffix_number)` without searching the tree.
+
+    Args:
+        site_map (SiteMap): The `SiteMap` object to index.
+
+    Returns:
+        dict[str, Article | Category]: The pages keyed by the numbers their URLs end with.
+    """
+    index: dict[str, Article | Category] = {}
+    for page in iter_pages(site_map):
+        page_id = get_page_id(page.url)
+        if page_id is not None:
+            # The first page in search order wins, as in `find_page_by_id`
+            index.setdefault(page_id, page)
 
-    def search(categories):
-        for category in categories:
-            # Check if the category's URL ends with the suffix
-            if category.url.endswith(suffix_str):
-                return category
+    return index
 
-            # Check if any article's URL in the category ends with the suffix
-            for article in category.articles:
-                if article.url.endswith(suffix_str):
-                    return article
 
-            # Recursively search within subcategories
-            result = search(category.subcategories)
-            if result:
-                return result
-        return None
+def find_pages_by_ids(site_map: SiteMap, suffix_numbers: Iterable[int]) -> dict[int, Article | Category | None]:
+    """
+    Searches for the pages of many numbers at once, walking the `SiteMap` a single time.
+
+    Args:
+        site_map (SiteMap): The `SiteMap` object to search within.
+        suffix_numbers (Iterable[int]): The numbers that the URLs should end with.
 
-    return search(site_map.categories)
+    Returns:
+        dict[int, Article | Category | None]: For each number, the page `find_page_by_id` would return for it.
+    """
+    index = build_page_index(site_map)
+    return {suffix_number: index.get(str(suffix_number)) for suffix_number in suffix_numbers}